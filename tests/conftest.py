@@ -1,6 +1,8 @@
 from typing import List
 
+import aiohttp
 import pytest
+import pytest_asyncio
 
 pytest_plugins = ("pytest_asyncio",)
 
@@ -26,3 +28,11 @@ def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item
     for item in items:
         if "integration" in item.keywords:
             item.add_marker(skip_integration)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def session():
+    """one `ClientSession` (and connection pool) shared by all tests"""
+
+    async with aiohttp.ClientSession() as session:
+        yield session
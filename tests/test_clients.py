@@ -1,9 +1,11 @@
+import asyncio
+import gc
 import os
+import time
 
-import aiohttp
 import pytest
 
-from tsl.clients.common import OperationFailed
+from tsl.clients.common import USER_AGENT, AsyncClient, OperationFailed, UrlParams
 from tsl.clients.deviations import DeviationsClient
 from tsl.clients.stoplookup import StopLookupClient
 from tsl.clients.transport import TransportClient
@@ -12,11 +14,81 @@ from tsl.models.deviations import Deviation, TransportMode
 from tsl.models.sites import Site
 from tsl.models.stops import Stop
 
+_DEVIATION_SCHEMA = Deviation.schema()
+_SITE_DEPARTURE_SCHEMA = SiteDepartureResponse.schema()
+_SITE_SCHEMA = Site.schema()
+_STOP_SCHEMA = Stop.schema()
+
+# run in the same event loop as the session-scoped `session` fixture
+pytestmark = pytest.mark.asyncio(scope="session")
+
+
+class FakeRequestJson:
+    """stands in for `AsyncClient._request_json` and counts the calls"""
+
+    def __init__(self, response, delay: float = 0):
+        self.response = response
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, args):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
 
 @pytest.fixture
-async def session():
-    async with aiohttp.ClientSession() as session:
-        yield session
+def fake_request_json(monkeypatch):
+    def _patch(client: AsyncClient, response, delay: float = 0) -> FakeRequestJson:
+        fake = FakeRequestJson(response, delay)
+        monkeypatch.setattr(client, "_request_json", fake)
+        return fake
+
+    return _patch
+
+
+async def test_user_agent(session):
+    cl = DeviationsClient(session)
+    assert cl.user_agent == USER_AGENT
+    assert cl._headers["User-Agent"] == USER_AGENT
+
+    cl.user_agent = "custom/1.0"
+    assert cl.user_agent == "custom/1.0"
+    assert cl._headers["User-Agent"] == "custom/1.0"
+
+    class Mine(AsyncClient):
+        user_agent = "mine/1.0"
+
+    assert Mine(session)._headers["User-Agent"] == "mine/1.0"
+
+
+async def test_max_concurrent(session, monkeypatch):
+    cl = AsyncClient(session, max_concurrent=2)
+    running = peak = 0
+
+    async def get_json(args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {}
+
+    monkeypatch.setattr(cl, "_get_json", get_json)
+
+    # created lazily inside the running loop, not in __init__
+    assert cl._semaphore is None
+
+    args = UrlParams("https://example.com", None)
+    await asyncio.gather(*(cl._request_json(args) for _ in range(10)))
+    assert peak == 2
+
+
+async def test_max_concurrent_invalid(session):
+    with pytest.raises(ValueError):
+        AsyncClient(session, max_concurrent=0)
 
 
 @pytest.mark.integration
@@ -28,10 +100,104 @@ async def test_deviations(session):
     )
 
     # serialization loop
-    raw = Deviation.schema().dumps(deviations, many=True)
+    raw = _DEVIATION_SCHEMA.dumps(deviations, many=True)
     # ... with extra data to be ignored
     raw = raw[:-2] + ', "extra": "data"}]'
-    Deviation.schema().loads(raw, many=True)
+    _DEVIATION_SCHEMA.loads(raw, many=True)
+
+
+async def test_deviations_coalesced(session, fake_request_json):
+    cl = DeviationsClient(session)
+    request = fake_request_json(cl, [])
+
+    # identical concurrent calls share one request
+    first, second, other = await asyncio.gather(
+        cl.get_deviations(line=["10"]),
+        cl.get_deviations(line=["10"]),
+        cl.get_deviations(line=["43"]),
+    )
+    assert request.calls == 2
+    assert first == second == other == []
+    assert first is not second
+
+    # completed requests are not reused
+    await cl.get_deviations(line=["10"])
+    assert request.calls == 3
+
+
+async def test_deviations_coalesced_cancelled(session, fake_request_json):
+    cl = DeviationsClient(session)
+    request = fake_request_json(cl, [], delay=0.01)
+
+    first = asyncio.ensure_future(cl.get_deviations(line=["10"]))
+    second = asyncio.ensure_future(cl.get_deviations(line=["10"]))
+    await asyncio.sleep(0)
+
+    # cancelling one caller must not cancel the shared request
+    first.cancel()
+    assert await second == []
+    assert first.cancelled()
+    assert request.calls == 1
+    assert cl._pending == {}
+
+
+async def test_deviations_coalesced_failure(session, fake_request_json, caplog):
+    cl = DeviationsClient(session)
+    request = fake_request_json(cl, RuntimeError("boom"))
+
+    first, second = await asyncio.gather(
+        cl.get_deviations(line=["10"]),
+        cl.get_deviations(line=["10"]),
+        return_exceptions=True,
+    )
+    assert request.calls == 1
+    assert isinstance(first, RuntimeError)
+    assert first is second
+    assert cl._pending == {}
+
+    # the only waiter is cancelled before the request fails
+    request.delay = 0.01
+    waiter = asyncio.ensure_future(cl.get_deviations(line=["10"]))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0.02)
+    assert request.calls == 2
+    assert cl._pending == {}
+
+    # nobody saw those errors, but asyncio must not report them on gc
+    del first, second, waiter
+    gc.collect()
+    await asyncio.sleep(0)
+    assert "never retrieved" not in caplog.text
+
+
+async def test_stop_lookup_coalesced(session, fake_request_json):
+    cl = StopLookupClient("", session)
+    request = fake_request_json(cl, {"StatusCode": 0, "ResponseData": []})
+
+    first, second, other = await asyncio.gather(
+        cl.get_stops("Oden"),
+        cl.get_stops("Oden"),
+        cl.get_stops("Oden", max_results=5),
+    )
+    assert request.calls == 2
+    assert first == second == other == []
+    assert first is not second
+
+
+async def test_stop_lookup_coalesced_failure(session, fake_request_json):
+    cl = StopLookupClient("", session)
+    request = fake_request_json(cl, {"StatusCode": 1, "Message": "x"})
+
+    first, second = await asyncio.gather(
+        cl.get_stops("Oden"),
+        cl.get_stops("Oden"),
+        return_exceptions=True,
+    )
+    assert request.calls == 1
+    assert isinstance(first, OperationFailed)
+    assert first is second
+    assert (first.code, first.message) == (1, "x")
 
 
 @pytest.mark.integration
@@ -45,10 +211,10 @@ async def test_transport_departures(session):
         assert isinstance(response.departures[0], Departure)
 
     # serialization loop
-    raw = SiteDepartureResponse.schema().dumps(response)
+    raw = _SITE_DEPARTURE_SCHEMA.dumps(response)
     # ... with extra data to be ignored
     raw = raw[:-1] + ', "extra": "data"}'
-    SiteDepartureResponse.schema().loads(raw)
+    _SITE_DEPARTURE_SCHEMA.loads(raw)
 
 
 @pytest.mark.integration
@@ -57,10 +223,44 @@ async def test_transport_sites(session):
     sites = await cl.get_sites()
 
     # serialization loop
-    raw = Site.schema().dumps(sites, many=True)
+    raw = _SITE_SCHEMA.dumps(sites, many=True)
     # ... with extra data to be ignored
     raw = raw[:-2] + ', "extra": "data"}]'
-    Site.schema().loads(raw, many=True)
+    _SITE_SCHEMA.loads(raw, many=True)
+
+
+@pytest.mark.parametrize("sites_ttl,expected_calls", [(None, 2), (60, 1)])
+async def test_transport_sites_cached(
+    session, fake_request_json, sites_ttl, expected_calls
+):
+    cl = TransportClient(session, sites_ttl=sites_ttl)
+    request = fake_request_json(cl, [])
+
+    first = await cl.get_sites()
+    second = await cl.get_sites()
+    assert request.calls == expected_calls
+    assert first == second == []
+    assert first is not second
+
+
+async def test_transport_sites_expired(session, fake_request_json, monkeypatch):
+    cl = TransportClient(session, sites_ttl=60)
+    request = fake_request_json(cl, [], delay=0.01)
+
+    now = time.monotonic()
+    # patch the module's own reference so the event loop clock is untouched
+    monkeypatch.setattr("tsl.clients.transport.monotonic", lambda: now)
+
+    await cl.get_sites()
+    cached = cl._sites
+    assert request.calls == 1
+
+    # past the ttl the sites are requested again and the cache entry replaced
+    now += 61
+    await cl.get_sites()
+    assert request.calls == 2
+    assert cl._sites is not cached
+    assert cl._sites is not None and cl._sites[0] == now + 60
 
 
 @pytest.mark.integration
@@ -72,7 +272,7 @@ async def test_stop_lookup(session):
     stops = await cl.get_stops("Oden")
 
     # serialization loop
-    raw = Stop.schema().dumps(stops, many=True)
+    raw = _STOP_SCHEMA.dumps(stops, many=True)
     # ... with extra data to be ignored
     raw = raw[:-2] + ', "extra": "data"}]'
-    Stop.schema().loads(raw, many=True)
+    _STOP_SCHEMA.loads(raw, many=True)
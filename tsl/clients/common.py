@@ -1,16 +1,37 @@
+import asyncio
 import logging
-from functools import cached_property
-from typing import Any, Dict, List, NamedTuple, Tuple, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import aiohttp
 
 from .. import __version__
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # optional `speedups` extra is not installed
+    from json import loads as json_loads
+
+T = TypeVar("T")
 Params = Union[List[Tuple[str, str]], Dict[str, Any], None]
 
 PARAM_KEY = "key"
 SENSITIVE_PARAMS = {PARAM_KEY}
 
+USER_AGENT = f"{aiohttp.http.SERVER_SOFTWARE} trafiklab-sl/{__version__}"
+_BASE_HEADERS = {"Content-Type": "application/json"}
+
 
 class UrlParams(NamedTuple):
     url: str
@@ -18,13 +39,32 @@ class UrlParams(NamedTuple):
 
 
 class AsyncClient:
-    def __init__(self, session: aiohttp.ClientSession) -> None:
+    user_agent = USER_AGENT
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_concurrent: Optional[int] = None,
+    ) -> None:
+        """
+        :param max_concurrent: max number of requests this client runs at once.
+            unlimited if `None`
+        """
+
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+
         self._session = session
+        self._max_concurrent = max_concurrent
+        # created on first request so that it binds to the running loop (python 3.9)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[Hashable, "asyncio.Future[Any]"] = {}
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    @cached_property
-    def user_agent(self):
-        return f"{aiohttp.http.SERVER_SOFTWARE} trafiklab-sl/{__version__}"
+    @property
+    def _headers(self) -> Dict[str, str]:
+        # resolved per request so subclass and instance overrides of `user_agent` apply
+        return {**_BASE_HEADERS, "User-Agent": self.user_agent}
 
     def _safe_params(self, params: Params) -> Params:
         if isinstance(params, dict):
@@ -40,20 +80,52 @@ class AsyncClient:
 
         return safe_params
 
+    async def _coalesce(
+        self, key: Hashable, fetch: Callable[[], Awaitable[List[T]]]
+    ) -> List[T]:
+        """
+        await `fetch()` once for all concurrent callers with the same `key`.
+
+        every caller gets its own copy of the resulting list.
+        the result is not kept once the call completes.
+        """
+
+        if (pending := self._pending.get(key)) is None:
+            pending = self._pending[key] = asyncio.ensure_future(fetch())
+
+            def _done(future: "asyncio.Future[Any]"):
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+                # waiters that got cancelled never see the error. mark it as retrieved
+                if not future.cancelled():
+                    future.exception()
+
+            pending.add_done_callback(_done)
+
+        # one caller being cancelled must not cancel the request for the others
+        return list(await asyncio.shield(pending))
+
     async def _request_json(self, args: UrlParams):
+        if self._max_concurrent is None:
+            return await self._get_json(args)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+
+        async with self._semaphore:
+            return await self._get_json(args)
+
+    async def _get_json(self, args: UrlParams):
         self.logger.debug(
             f"Requesting {args.url} with params {self._safe_params(args.params)}"
         )
         response = await self._session.get(
             args.url,
             params=args.params,
-            headers={
-                "Content-Type": "application/json",
-                "User-Agent": self.user_agent,
-            },
+            headers=self._headers,
         )
         response.raise_for_status()
-        json = await response.json()
+        json = await response.json(loads=json_loads)
         return json
 
 
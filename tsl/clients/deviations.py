@@ -5,6 +5,8 @@ from .common import AsyncClient, UrlParams
 
 __all__ = ("DeviationsClient",)
 
+_DEVIATIONS_SCHEMA = Deviation.schema(many=True)
+
 
 class DeviationsClient(AsyncClient):
     """
@@ -26,13 +28,13 @@ class DeviationsClient(AsyncClient):
         if future is not None:
             params.append(("future", "true" if future else "false"))
         if site is not None:
-            params.extend(("site", str(x)) for x in site)
+            params.extend([("site", str(x)) for x in site])
         if line is not None:
-            params.extend(("line", str(x)) for x in line)
+            params.extend([("line", str(x)) for x in line])
         if transport_authority is not None:
             params.append(("transport_authority", str(transport_authority)))
         if transport_mode is not None:
-            params.extend(("transport_mode", x.value) for x in transport_mode)
+            params.extend([("transport_mode", x.value) for x in transport_mode])
 
         return UrlParams("https://deviations.integration.sl.se/v1/messages", params)
 
@@ -44,9 +46,18 @@ class DeviationsClient(AsyncClient):
         transport_authority: Optional[int] = None,
         transport_mode: Optional[List[TransportMode]] = None,
     ) -> List[Deviation]:
+        """
+        Get deviations matching the filters.
+
+        Concurrent calls with the same filters share a single request.
+        """
 
         args = self.get_request_url_params(
             future, site, line, transport_authority, transport_mode
         )
+        key = (args.url, tuple(args.params or ()))
+        return await self._coalesce(key, lambda: self._fetch_deviations(args))
+
+    async def _fetch_deviations(self, args: UrlParams) -> List[Deviation]:
         response = await self._request_json(args)
-        return Deviation.schema().load(response, many=True)
+        return _DEVIATIONS_SCHEMA.load(response)
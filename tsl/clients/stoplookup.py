@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 import aiohttp
 
@@ -11,6 +11,8 @@ from .common import (
     UrlParams,
 )
 
+_STOPS_SCHEMA = Stop.schema(many=True)
+
 
 class StopLookupClient(AsyncClient):
     """
@@ -18,12 +20,17 @@ class StopLookupClient(AsyncClient):
     https://www.trafiklab.se/api/trafiklab-apis/sl/stop-lookup/
     """
 
-    def __init__(self, api_key: str, session: aiohttp.ClientSession):
+    def __init__(
+        self,
+        api_key: str,
+        session: aiohttp.ClientSession,
+        max_concurrent: Optional[int] = None,
+    ):
         """
         :param api_key: the "Trafikverket öppet API" key
         """
 
-        super().__init__(session)
+        super().__init__(session, max_concurrent)
         self._api_key = api_key
 
     @staticmethod
@@ -55,9 +62,16 @@ class StopLookupClient(AsyncClient):
     async def get_stops(self, search_string: str, max_results: int = 10) -> List[Stop]:
         """
         Get stops by search string
+
+        Concurrent calls with the same arguments share a single request.
         """
 
         args = self.get_request_url_params(self._api_key, search_string, max_results)
+        return await self._coalesce(
+            (search_string, max_results), lambda: self._fetch_stops(args)
+        )
+
+    async def _fetch_stops(self, args: UrlParams) -> List[Stop]:
         response = await self._request_json(args)
 
         if (code := response.get("StatusCode")) is None:
@@ -68,4 +82,4 @@ class StopLookupClient(AsyncClient):
         if (data := response.get("ResponseData")) is None:
             raise ResponseFormatChanged("'ResponseData' not found in response")
 
-        return Stop.schema().load(data, many=True)
+        return _STOPS_SCHEMA.load(data)
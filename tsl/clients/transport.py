@@ -1,12 +1,20 @@
-from typing import Any, Optional
+from time import monotonic
+from typing import Any, List, Optional, Tuple
 from urllib.parse import quote
 
+import aiohttp
+
 from ..models.departures import SiteDepartureResponse, TransportMode
 from ..models.sites import Site
 from .common import AsyncClient, UrlParams
 
 __all__ = ("TransportClient",)
 
+_SITES_URL = "https://transport.integration.sl.se/v1/sites"
+
+_SITE_DEPARTURES_SCHEMA = SiteDepartureResponse.schema()
+_SITES_SCHEMA = Site.schema(many=True)
+
 
 class TransportClient(AsyncClient):
     """
@@ -16,6 +24,21 @@ class TransportClient(AsyncClient):
     only departures and sites are supported at the moment
     """
 
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_concurrent: Optional[int] = None,
+        sites_ttl: Optional[float] = None,
+    ):
+        """
+        :param sites_ttl: seconds to reuse the `get_sites` result for.
+            not cached if `None`
+        """
+
+        super().__init__(session, max_concurrent)
+        self._sites_ttl = sites_ttl
+        self._sites: Optional[Tuple[float, List[Site]]] = None
+
     @staticmethod
     def get_departures_url_params(
         site_id: int,
@@ -24,10 +47,7 @@ class TransportClient(AsyncClient):
         line: Optional[int] = None,
         forecast: int = 60,
     ) -> UrlParams:
-        url = (
-            "https://transport.integration.sl.se"
-            f"/v1/sites/{quote(str(site_id))}/departures"
-        )
+        url = f"{_SITES_URL}/{quote(str(site_id))}/departures"
         params: dict[str, Any] = {}
         if transport is not None:
             params["transport"] = transport.value
@@ -59,11 +79,29 @@ class TransportClient(AsyncClient):
 
         response = await self._request_json(args)
 
-        return SiteDepartureResponse.schema().load(response)
+        return _SITE_DEPARTURES_SCHEMA.load(response)
+
+    async def get_sites(self) -> List[Site]:
+        """
+        List all sites within Region Stockholm
+
+        The result is reused for `sites_ttl` seconds if set.
+        Concurrent calls share a single request.
+        """
+
+        if self._sites is not None:
+            expires, sites = self._sites
+            if monotonic() < expires:
+                return list(sites)
 
-    async def get_sites(self):
-        """List all sites within Region Stockholm"""
+        return await self._coalesce(_SITES_URL, self._fetch_sites)
 
-        args = UrlParams("https://transport.integration.sl.se/v1/sites", None)
+    async def _fetch_sites(self) -> List[Site]:
+        args = UrlParams(_SITES_URL, None)
         response = await self._request_json(args)
-        return Site.schema().load(response, many=True)
+        sites = _SITES_SCHEMA.load(response)
+
+        if self._sites_ttl is not None:
+            self._sites = (monotonic() + self._sites_ttl, sites)
+
+        return sites